@@ -4,7 +4,9 @@ import asyncio
 import random
 import time
 from pathlib import Path
-from fastapi import FastAPI, Request
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from loguru import logger
 from psycopg2 import OperationalError, errors
@@ -24,6 +26,7 @@ from src.routes.content_manager import router as content_manager_router
 from src.routes.song_generator import router as song_processing_router
 from src.routes.health import router as health_router
 from src.routes.database_explorer import router as database_explorer_router
+from src.routes.uploads import router as uploads_router
 
 # Read environment variables
 LOG_DIR = Path(os.getenv("LOG_DIR", "logs"))
@@ -44,7 +47,7 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 # Configure Loguru logging (logging to file and console)
 LOG_FILE = LOG_DIR / "app.log"
-logger.add(LOG_FILE, rotation=LOG_FILE_SIZE, retention=LOG_RETENTION, level=LOG_LEVEL)
+logger.add(LOG_FILE, rotation=LOG_FILE_SIZE, retention=LOG_RETENTION, level=LOG_LEVEL, enqueue=True)
 logger.add(sys.stdout, level="INFO")
 
 async def wait_for_db(max_retries=DB_RETRY_ATTEMPTS, base_delay=DB_RETRY_DELAY):
@@ -56,7 +59,7 @@ async def wait_for_db(max_retries=DB_RETRY_ATTEMPTS, base_delay=DB_RETRY_DELAY):
             logger.success("✅ Database initialized successfully.")
             return
         except (OperationalError, errors.DatabaseError) as e:
-            delay_time = min(base_delay * (2 ** attempt) + random.uniform(0, 1), 60)
+            delay_time = random.uniform(0, min(60, base_delay * (1 << attempt)))
             logger.warning(f"⚠️ Database not ready. Retrying in {delay_time:.2f}s - {e}")
             await asyncio.sleep(delay_time)
         except Exception as e:
@@ -70,32 +73,51 @@ async def wait_for_db(max_retries=DB_RETRY_ATTEMPTS, base_delay=DB_RETRY_DELAY):
 async def lifespan(app: FastAPI):
     """Ensures database is initialized before the app starts and handles cleanup on shutdown."""
     await wait_for_db()
+    # Long-lived outbound HTTP client shared by routes (keep-alive pooling)
+    app.state.http = httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
     yield  # Application runs here
+    await app.state.http.aclose()
     logger.info("🛑 FastAPI application is shutting down...")
 
-def create_app() -> FastAPI:
-    """Creates the FastAPI application with middleware and routes."""
-    app = FastAPI(lifespan=lifespan)
+class TimingMiddleware:
+    """Pure ASGI middleware logging method, path, status and duration per request.
+
+    Avoids Starlette's BaseHTTPMiddleware task wrapping and uses the monotonic
+    perf_counter_ns clock instead of wall time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                duration_ms = (time.perf_counter_ns() - start) / 1e6
+                logger.info(f"📤 {scope['method']} {scope['path']} - {message['status']} [{duration_ms:.2f}ms]")
+            await send(message)
 
-    # Middleware for logging requests
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next):
-        """Middleware to log incoming API requests and their responses."""
-        start_time = time.time()
-        response = None  # Ensure response is always defined
-        
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            logger.error(f"❌ Unhandled error in request {request.method} {request.url}: {e}")
-            response = None  # Ensure response is defined in case of an error
-            raise e  # Re-raise the exception after logging
-        finally:
-            duration = round(time.time() - start_time, 3)
-            status_code = response.status_code if response else 500  # Default to 500 if response is None
-            logger.info(f"📤 {request.method} {request.url} - {status_code} [{duration}s]")
+            logger.error(f"❌ Unhandled error in request {scope['method']} {scope['path']}: {e}")
+            raise
+
+def create_app() -> FastAPI:
+    """Creates the FastAPI application with middleware and routes."""
+    # orjson serializes the large listing payloads several times faster than stdlib json
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
-        return response
+    # Middleware for logging requests
+    app.add_middleware(TimingMiddleware)
 
     # Register API routes
     routers = [
@@ -103,6 +125,7 @@ def create_app() -> FastAPI:
         health_router,
         database_explorer_router,
         song_processing_router,
+        uploads_router,
     ]
     for router in routers:
         app.include_router(router, prefix="")
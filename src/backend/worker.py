@@ -1,11 +1,17 @@
 import os
 import sys
 import asyncio
+import random
 import signal
-import requests
+import httpx
+import uvloop
+from dataclasses import dataclass
 from loguru import logger
 from dotenv import load_dotenv
 
+# Use uvloop's C event loop for all asyncio in this process
+uvloop.install()
+
 # Load environment variables
 load_dotenv()
 
@@ -25,7 +31,7 @@ LOG_COMPRESSION = os.getenv("LOG_COMPRESSION", "zip")
 os.makedirs(LOG_DIR, exist_ok=True)
 
 # Configure Loguru logging
-logger.add(LOG_FILE, rotation=LOG_FILE_SIZE, retention=LOG_RETENTION, compression=LOG_COMPRESSION, level=LOG_LEVEL)
+logger.add(LOG_FILE, rotation=LOG_FILE_SIZE, retention=LOG_RETENTION, compression=LOG_COMPRESSION, level=LOG_LEVEL, enqueue=True)
 
 if DEBUG_MODE:
     logger.add(sys.stdout, level="DEBUG")
@@ -34,39 +40,91 @@ if DEBUG_MODE:
 # Global control for worker loop
 RUNNING = True
 
+# Set by the signal handler so the loop's wait ends immediately instead of
+# running out the full health interval (up to MAX_INTERVAL seconds)
+_shutdown_event = asyncio.Event()
+_loop = None  # Captured by worker_loop for call_soon_threadsafe
+
+# Polling intervals (seconds)
+BASE_INTERVAL = 30      # Starting interval while the API is healthy
+MAX_INTERVAL = 300      # Interval ceiling after sustained health
+UNHEALTHY_INTERVAL = 10  # Re-check quickly while the API is down
+MAX_BACKOFF_TOTAL = 30  # Cap on cumulative retry backoff inside one check
+
+# Shared async HTTP client (keep-alive) so health checks never block the event loop
+_http = httpx.AsyncClient(timeout=5, limits=httpx.Limits(max_keepalive_connections=4))
+
+@dataclass
+class HealthState:
+    """Last observed API health, readable by other tasks without extra polling."""
+    healthy: bool = False
+    consecutive_healthy: int = 0
+    interval: float = BASE_INTERVAL
+
+health_state = HealthState()
+
 async def check_api():
-    """Checks API health status with retries and exponential backoff."""
+    """Checks API health status with retries and bounded, jittered backoff."""
     retries = 5
     base_delay = 5  # Initial delay in seconds
+    backoff_budget = MAX_BACKOFF_TOTAL
 
     for attempt in range(retries):
         try:
-            response = requests.get(f"{API_URL}/health", timeout=5)
-            response.raise_for_status()
-            data = response.json() if "application/json" in response.headers.get("content-type", "") else response.text
-            logger.info(f"✅ API Health Check: {response.status_code} - {data}")
+            # Stream so we only ever read a bounded snippet of the body
+            async with _http.stream("GET", f"{API_URL}/health") as response:
+                response.raise_for_status()
+                snippet = b""
+                async for chunk in response.aiter_bytes(256):
+                    snippet = chunk[:256]
+                    break
+            logger.info(f"✅ API Health Check: {response.status_code} - {snippet.decode(errors='replace')}")
             return True
-        except requests.Timeout:
+        except httpx.TimeoutException:
             logger.warning(f"⚠️ API Health Check Timeout (Attempt {attempt + 1}/{retries})")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"❌ API Connection Failed (Attempt {attempt + 1}/{retries}): {e}")
 
-        # Exponential backoff
-        delay = min(base_delay * (2 ** attempt), 60)  # Cap delay at 60s
+        if backoff_budget <= 0:
+            break
+
+        # Full-jitter exponential backoff (decorrelates concurrent workers),
+        # bounded so an outage never blocks the loop for minutes at a time.
+        delay = min(random.uniform(0, min(60, base_delay * (1 << attempt))), backoff_budget)
+        backoff_budget -= delay
         await asyncio.sleep(delay)
 
     logger.error("🚨 API Health Check failed after multiple attempts.")
     return False
 
+def _update_health_state(healthy: bool):
+    """Record the latest check and adapt the polling interval."""
+    health_state.healthy = healthy
+    if healthy:
+        health_state.consecutive_healthy += 1
+        # Stretch the interval while the API stays healthy: 30s -> 60s -> ... -> 300s
+        health_state.interval = min(BASE_INTERVAL * (1 << (health_state.consecutive_healthy - 1)), MAX_INTERVAL)
+    else:
+        health_state.consecutive_healthy = 0
+        health_state.interval = UNHEALTHY_INTERVAL
+
 async def worker_loop():
     """Main worker loop with controlled shutdown."""
-    global RUNNING
+    global _loop
+    _loop = asyncio.get_running_loop()
     logger.info("🚀 Worker started...")
 
-    while RUNNING:
-        healthy = await check_api()
-        retry_delay = 30 if healthy else 10  # Adjust retry delay based on API status
-        await asyncio.sleep(retry_delay)
+    try:
+        while RUNNING:
+            _update_health_state(await check_api())
+            try:
+                # Interruptible sleep: graceful_shutdown sets the event, so
+                # SIGTERM never waits out a stretched healthy interval
+                await asyncio.wait_for(_shutdown_event.wait(), timeout=health_state.interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await _http.aclose()
 
     logger.info("🛑 Worker stopped.")
 
@@ -75,6 +133,8 @@ def graceful_shutdown(signum, frame):
     global RUNNING
     logger.warning("⚠️ Received shutdown signal. Stopping worker...")
     RUNNING = False
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_shutdown_event.set)
 
 # Register signal handlers for clean exit
 signal.signal(signal.SIGTERM, graceful_shutdown)
@@ -1,4 +1,6 @@
+import atexit
 import os
+import hashlib
 import psycopg2
 from psycopg2 import pool, OperationalError, errors
 from loguru import logger
@@ -17,22 +19,32 @@ DB_USER = os.getenv("DB_USER", "clonehero")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "clonehero")
 DB_PORT = os.getenv("DB_PORT", "5432")
 
+# Pool sizing (tunable per deploy; FastAPI's threadpool can hold many connections at once)
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", 5))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 25))
+
 # Database connection pool
 db_pool = None
 
+# Connections that already ran the PREPAREs this pool lifetime. psycopg2's C
+# connection type has no instance __dict__, so the flag can't live on the
+# object itself; the set is cleared whenever the pool is (re)built.
+_prepared_conns: set = set()
+
 def create_db_pool(retries=5, delay=5):
     """Creates a database connection pool with retry logic."""
     global db_pool
+    _prepared_conns.clear()
     for attempt in range(retries):
         try:
             if DB_URL:
                 logger.info("🔗 Using DB_URL for connection.")
-                db_pool = pool.SimpleConnectionPool(minconn=1, maxconn=10, dsn=DB_URL)
+                db_pool = pool.ThreadedConnectionPool(minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX, dsn=DB_URL)
             else:
                 logger.info("🔗 Using individual DB settings for connection.")
-                db_pool = pool.SimpleConnectionPool(
-                    minconn=1,
-                    maxconn=10,
+                db_pool = pool.ThreadedConnectionPool(
+                    minconn=DB_POOL_MIN,
+                    maxconn=DB_POOL_MAX,
                     host=DB_HOST,
                     database=DB_NAME,
                     user=DB_USER,
@@ -50,17 +62,69 @@ def create_db_pool(retries=5, delay=5):
 
 create_db_pool()
 
+def close_db_pool():
+    """Close every pooled connection so the server sees clean disconnects on exit."""
+    global db_pool
+    if db_pool is not None and not db_pool.closed:
+        db_pool.closeall()
+        logger.info("🔌 Database connection pool closed.")
+    db_pool = None
+    _prepared_conns.clear()
+
+atexit.register(close_db_pool)
+
+# Hot statements PREPAREd once per pooled connection so Postgres skips
+# re-parsing/planning the same SQL text on every catalog request
+_PREPARED_STATEMENTS = {
+    "songs_page": (
+        "SELECT id, title, artist, album, file_path, metadata, count(*) OVER () AS total "
+        "FROM songs ORDER BY id DESC LIMIT $1 OFFSET $2"
+    ),
+    "songs_search": (
+        "SELECT id, title, artist, album, file_path, metadata, count(*) OVER () AS total "
+        "FROM songs WHERE (title || ' ' || artist || ' ' || album) ILIKE $1 "
+        "ORDER BY id DESC LIMIT $2 OFFSET $3"
+    ),
+    "content_page": (
+        "SELECT id, title, artist, album, file_path, metadata, count(*) OVER () AS total "
+        "FROM songs ORDER BY lower(artist), lower(album), lower(title) LIMIT $1 OFFSET $2"
+    ),
+    "song_exists": "SELECT id FROM songs WHERE id = $1",
+    "song_delete": "DELETE FROM songs WHERE id = $1",
+}
+
+def _prepare_hot_statements(conn):
+    """Run the PREPAREs once per connection; pooled reuse keeps them alive."""
+    if id(conn) in _prepared_conns:
+        return
+    try:
+        with conn.cursor() as cursor:
+            # Ask the server what already exists rather than catching
+            # DuplicatePreparedStatement: the rollback that error would force
+            # also deallocates every statement PREPAREd earlier in the
+            # transaction, leaving the connection half-prepared.
+            cursor.execute("SELECT name FROM pg_prepared_statements")
+            existing = {row[0] for row in cursor.fetchall()}
+            for name, statement in _PREPARED_STATEMENTS.items():
+                if name not in existing:
+                    cursor.execute(f"PREPARE {name} AS {statement}")
+        conn.commit()
+    except errors.UndefinedTable:
+        conn.rollback()  # Schema not applied yet (first boot); retry next checkout
+        return
+    _prepared_conns.add(id(conn))
+
 @contextmanager
 def get_connection():
     """Context manager for safely acquiring and releasing a database connection."""
     if db_pool is None:
         logger.error("❌ Database pool is not initialized.")
         raise RuntimeError("Database pool is unavailable.")
-    
+
     conn = None
     try:
         conn = db_pool.getconn()
-        logger.debug("🔗 Database connection acquired.")
+        _prepare_hot_statements(conn)
         yield conn
     except OperationalError as e:
         logger.error(f"⚠️ Database connection error: {e}")
@@ -68,20 +132,35 @@ def get_connection():
     finally:
         if conn:
             db_pool.putconn(conn)
-            logger.debug("🔓 Database connection released.")
 
 def execute_sql_file(sql_file: str):
-    """Executes an SQL file with better error handling."""
+    """Executes an SQL file, skipping it when this exact content was already applied."""
     try:
         with open(sql_file, "r", encoding="utf-8") as f:
             sql_commands = f.read().strip()
             if not sql_commands:
                 logger.warning(f"⚠️ Skipping empty SQL file: {sql_file}")
                 return
-        
+
+        sha = hashlib.sha256(sql_commands.encode()).hexdigest()
+
         with get_connection() as conn:
+            conn.autocommit = False
             with conn.cursor() as cursor:
+                cursor.execute(
+                    "CREATE TABLE IF NOT EXISTS schema_migrations "
+                    "(sha TEXT PRIMARY KEY, applied_at TIMESTAMPTZ DEFAULT now())"
+                )
+                cursor.execute("SELECT 1 FROM schema_migrations WHERE sha = %s", (sha,))
+                if cursor.fetchone():
+                    conn.commit()
+                    logger.info(f"⏭️ Schema unchanged, skipping: {sql_file}")
+                    return
+
+                # Skip per-DDL fsyncs during schema load; only applies to this transaction
+                cursor.execute("SET LOCAL synchronous_commit = off")
                 cursor.execute(sql_commands)
+                cursor.execute("INSERT INTO schema_migrations (sha) VALUES (%s)", (sha,))
             conn.commit()
             logger.info(f"✅ Successfully executed SQL file: {sql_file}")
     except (OperationalError, errors.DatabaseError) as e:
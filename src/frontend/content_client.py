@@ -0,0 +1,118 @@
+import time
+
+import orjson
+import streamlit as st
+import requests
+from requests_toolbelt import MultipartEncoder
+from loguru import logger
+from src.utils import API_URL, display_exception, http
+
+
+@st.cache_data(ttl=30)
+def _list_cached(content_type: str) -> list:
+    """Fetch stored file names for a content type from the API (cached across reruns)."""
+    try:
+        response = http.get(f"{API_URL}/list_content/?content_type={content_type}", timeout=30)
+        response.raise_for_status()
+        return orjson.loads(response.content).get("files", [])
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch {content_type} listing: {e}")
+        return []
+
+
+def _error_detail(response) -> str:
+    """Pull the error detail from a failed API response, falling back to raw text."""
+    try:
+        return response.json().get("detail", response.text)
+    except ValueError:
+        return response.text
+
+
+class ContentClient:
+    """
+    Parametrized client for the content API (list/upload/delete).
+
+    Each instance is bound to one server-side content_type (e.g. "colors",
+    "image_highways") and a human-readable label used in UI feedback.
+    """
+
+    def __init__(self, content_type: str, label: str):
+        self.content_type = content_type
+        self.label = label
+
+    def list(self) -> list:
+        """Return the cached listing for this content type."""
+        return _list_cached(self.content_type)
+
+    def _wait_for_job(self, status_url: str, file_name: str, timeout: int = 600) -> bool:
+        """Poll a processing job until it settles; True only if it finished clean."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(2)
+            try:
+                response = http.get(f"{API_URL}{status_url}", timeout=10)
+                response.raise_for_status()
+                job = response.json()
+            except requests.RequestException as e:
+                logger.warning(f"Job poll failed for {file_name}: {e}")
+                continue
+
+            if job.get("state") == "done":
+                return True
+            if job.get("state") == "failed":
+                detail = job.get("error") or "unknown error"
+                st.error(f"Processing failed: {detail}")
+                logger.error(f"Processing failed for {file_name}: {detail}")
+                return False
+
+        st.warning("⏳ Still processing — refresh the listing in a bit.")
+        return False
+
+    def upload(self, uploaded_file):
+        """Stream an uploaded file to the API and surface UI feedback."""
+        uploaded = False
+        try:
+            logger.info(f"Uploading {self.label}: {uploaded_file.name}")
+            encoder = MultipartEncoder(fields={
+                "content_type": self.content_type,
+                "file": (uploaded_file.name, uploaded_file, uploaded_file.type),
+            })
+
+            with st.spinner("Uploading..."):
+                response = http.post(
+                    f"{API_URL}/upload_content/", data=encoder,
+                    headers={"Content-Type": encoder.content_type}, timeout=60
+                )
+
+            response.raise_for_status()
+
+            # 202 only means queued — follow the job so a bad archive (e.g. no
+            # song.ini) still surfaces its error here instead of a false success
+            status_url = response.json().get("status_url")
+            with st.spinner("Processing..."):
+                uploaded = self._wait_for_job(status_url, uploaded_file.name) if status_url else True
+        except requests.HTTPError:
+            detail = _error_detail(response)
+            st.error(f"Upload failed: {detail}")
+            logger.error(f"Upload failed for {uploaded_file.name}: {detail}")
+        except Exception as e:
+            display_exception(e, f"Error uploading {self.label}")
+
+        if uploaded:
+            st.success(f"✅ Upload successful: {uploaded_file.name}")
+            st.cache_data.clear()  # Drop cached listings so the new upload shows up
+            st.rerun()
+
+    def delete(self, name: str):
+        """Delete a stored file via the API and refresh listings."""
+        try:
+            response = http.delete(
+                f"{API_URL}/delete_content/?content_type={self.content_type}&file={name}", timeout=30
+            )
+            response.raise_for_status()
+            st.success(f"🗑️ Deleted `{name}` successfully!")
+            st.cache_data.clear()  # Invalidate cached listings
+            st.rerun()
+        except requests.RequestException as e:
+            logger.error(f"Failed to delete {name}: {e}")
+            st.error(f"Failed to delete `{name}`. Please try again.")
@@ -0,0 +1,8 @@
+# Shared upload-extension whitelists for the Streamlit pages.
+# Kept as frozensets so membership checks are O(1) and the literals live in one place.
+
+ARCHIVE = frozenset({"zip", "rar"})
+IMAGE_EXT = frozenset({"png", "jpg", "jpeg"}) | ARCHIVE
+VIDEO_BG_EXT = frozenset({"webm", "mp4", "avi", "mpeg"}) | ARCHIVE
+VIDEO_HW_EXT = frozenset({"webm"}) | ARCHIVE  # Clone Hero requires .webm for videos
+INI_EXT = frozenset({"ini"}) | ARCHIVE
@@ -1,10 +1,21 @@
+import importlib
 import streamlit as st
-from src.pages.song_generator import song_generation_page
-from src.pages.songs import songs_page
-from src.pages.database_explorer import database_explorer_page
-from src.pages.colors import colors_page
-from src.pages.backgrounds import backgrounds_page
-from src.pages.highways import highways_page
+
+# Pages are referenced as "module:function" and imported lazily, so a run only
+# pays the import cost of the page actually selected.
+PAGES = {
+    "📁 Database Explorer": "src.pages.database_explorer:database_explorer_page",
+    "📤 Upload Songs": "src.pages.songs:songs_page",
+    "🎵 Generate Songs": "src.pages.song_generator:song_generation_page",
+    "🎨 Colors": "src.pages.colors:colors_page",
+    "🌆 Backgrounds": "src.pages.backgrounds:backgrounds_page",
+    "🛣️ Highways": "src.pages.highways:highways_page",
+}
+
+def _resolve_page(target: str):
+    """Import the page module on demand and return its render function."""
+    module_name, func_name = target.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
 
 def setup_sidebar():
     """Define sidebar UI elements using native Streamlit components."""
@@ -12,19 +23,10 @@ def setup_sidebar():
     st.sidebar.title("Clone Hero Manager")
 
     # Navigation Menu (Pages First)
-    st.sidebar.markdown("---")    
+    st.sidebar.markdown("---")
     st.sidebar.markdown("### 📂 Navigation")
-    PAGES = {
-        "📁 Database Explorer": database_explorer_page,
-        "📤 Upload Songs": songs_page,
-        "🎵 Generate Songs": song_generation_page,
-        "🎨 Colors": colors_page,
-        "🌆 Backgrounds": backgrounds_page,
-        "🛣️ Highways": highways_page,
-    }
-    
     menu_selection = st.sidebar.radio("📌 Select a Page", list(PAGES.keys()))
-    
+
     # Refresh & Cache Clearing Options
     st.sidebar.markdown("---")
     if st.sidebar.button("🔄 Refresh App"):
@@ -39,4 +41,4 @@ def setup_sidebar():
     st.sidebar.write("🛠️ **Clone Hero Manager** - v1.0.0")
     st.sidebar.write("🚀 Developed with ❤️ using Streamlit")
 
-    return PAGES[menu_selection]
\ No newline at end of file
+    return _resolve_page(PAGES[menu_selection])
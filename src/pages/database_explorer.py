@@ -1,27 +1,37 @@
 import streamlit as st
+import json
+import orjson
 import requests
 from loguru import logger
-from src.utils import API_URL
+from src.utils import API_URL, http
 
 # Constants
 PAGE_SIZE = 10  # Number of songs per page
 
+@st.cache_data(max_entries=1024)
+def format_metadata(metadata_json: str) -> str:
+    """Drop empty fields and pretty-print metadata, memoized per unique payload."""
+    metadata = json.loads(metadata_json)
+    non_empty = {k: v for k, v in metadata.items() if v}  # Hide empty fields
+    return json.dumps(non_empty, indent=2, sort_keys=True) if non_empty else ""
+
 @st.cache_data(ttl=30)
 def fetch_songs(search_query=None, limit=PAGE_SIZE, offset=0):
-    """Fetch all songs from the database with optional search filtering and pagination."""
+    """Fetch a page of songs plus the server-side total, with optional search filtering."""
     try:
         params = {"search": search_query.strip() if search_query else None, "limit": limit, "offset": offset}
-        response = requests.get(f"{API_URL}/songs/", params=params, timeout=30)
+        response = http.get(f"{API_URL}/songs/", params=params, timeout=30)
         response.raise_for_status()
-        return response.json().get("songs", [])
+        data = orjson.loads(response.content)
+        return data.get("songs", []), data.get("total", 0)
     except requests.RequestException as e:
         logger.error(f"❌ Failed to fetch songs: {e}")
-        return []
+        return [], 0
 
 def delete_song(song_id):
     """Delete a song from the database and return a success or error response."""
     try:
-        response = requests.delete(f"{API_URL}/songs/{song_id}", timeout=30)
+        response = http.delete(f"{API_URL}/songs/{song_id}", timeout=30)
         response.raise_for_status()
         return {"success": True}
     except requests.RequestException as e:
@@ -46,7 +56,7 @@ def database_explorer_page():
         st.session_state.last_search = search_query
 
     # Fetch Songs
-    songs = fetch_songs(search_query, limit=PAGE_SIZE, offset=st.session_state.page * PAGE_SIZE)
+    songs, total = fetch_songs(search_query, limit=PAGE_SIZE, offset=st.session_state.page * PAGE_SIZE)
 
     if not songs:
         st.warning("⚠️ No songs found in the database.")
@@ -58,11 +68,10 @@ def database_explorer_page():
             st.write(f"**Album:** {song.get('album', 'Unknown')}")
             st.write(f"**File Path:** `{song.get('file_path', 'N/A')}`")
 
-            # Show Metadata if available
-            metadata = song.get("metadata", {})
-            non_empty_metadata = {k: v for k, v in metadata.items() if v}  # Hide empty fields
-            if non_empty_metadata:
-                st.json(non_empty_metadata, expanded=False)
+            # Show Metadata if available (formatted once per unique payload, not per rerun)
+            formatted = format_metadata(json.dumps(song.get("metadata", {}), sort_keys=True))
+            if formatted:
+                st.code(formatted, language="json")
 
             # Delete Button
             if st.button("🗑️ Delete", key=f"delete_{song['id']}"):
@@ -81,7 +90,7 @@ def database_explorer_page():
             st.session_state.page = max(st.session_state.page - 1, 0)
             st.rerun()
     with col3:
-        if st.button("Next ➡️", disabled=len(songs) < PAGE_SIZE):
+        if st.button("Next ➡️", disabled=st.session_state.page * PAGE_SIZE + len(songs) >= total):
             st.session_state.page += 1
             st.rerun()
 
@@ -1,14 +1,20 @@
+import os
 import streamlit as st
 import requests
 from loguru import logger
-from src.utils import API_URL, display_exception
+from src.utils import API_URL, display_exception, http
+
+# Browser-reachable base for direct download links. API_URL is the
+# docker-internal hostname (no published port), so links built from it are
+# dead outside the compose network.
+PUBLIC_API_URL = os.getenv("PUBLIC_API_URL", "")
 
 def process_song(file) -> dict:
     """Uploads a song to the backend for processing into Clone Hero format."""
     try:
         files = {"file": file}
         with st.spinner("Uploading and processing song..."):
-            response = requests.post(f"{API_URL}/process_song/", files=files, timeout=60)
+            response = http.post(f"{API_URL}/process_song/", files=files, timeout=60)
         
         response.raise_for_status()
         result = response.json()
@@ -49,20 +55,25 @@ def song_generation_page():
             st.write(f"🎵 **Generated Notes Chart:** `{result.get('notes_chart', 'N/A')}`")
             st.write(f"🎶 **Detected Tempo:** `{result.get('tempo', 'Unknown')} BPM`")
             
-            # Ensure download URL is valid before requesting
-            notes_chart_url = result.get("notes_chart")
+            notes_chart_url = result.get("notes_chart_url")
             if notes_chart_url:
-                try:
-                    response = requests.get(notes_chart_url, timeout=10)
-                    response.raise_for_status()
-                    st.download_button(
-                        "⬇️ Download notes.chart",
-                        data=response.content,
-                        file_name="notes.chart",
-                        mime="text/plain"
-                    )
-                except requests.RequestException as e:
-                    st.error(f"⚠️ Failed to retrieve the generated notes.chart file: {e}")
+                if PUBLIC_API_URL:
+                    # Browser fetches straight from the API — the bytes never
+                    # pass through the Streamlit process
+                    st.link_button("⬇️ Download notes.chart", f"{PUBLIC_API_URL.rstrip('/')}{notes_chart_url}")
+                else:
+                    # No public base configured: fetch over the internal
+                    # network and serve the (small) chart from this process
+                    try:
+                        chart = http.get(f"{API_URL}{notes_chart_url}", timeout=30)
+                        chart.raise_for_status()
+                        st.download_button(
+                            "⬇️ Download notes.chart", chart.content,
+                            file_name="notes.chart", mime="text/plain",
+                        )
+                    except requests.RequestException as e:
+                        logger.error(f"Failed to fetch notes.chart: {e}")
+                        st.error("Could not fetch the generated notes.chart.")
 
     st.markdown("---")
     st.subheader("📖 How It Works")
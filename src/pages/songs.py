@@ -1,52 +1,68 @@
+import json
+import orjson
 import streamlit as st
 import requests
 from loguru import logger
-from src.utils import API_URL, display_exception
-import itertools
+from src.utils import API_URL, display_exception, http
 
 # Constants
 PAGE_SIZE = 10  # Number of songs per page
 ALLOWED_EXTENSIONS = ["zip", "rar"]
 MAX_FILE_SIZE_GB = 10
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_GB * 1024 * 1024 * 1024  # 10GB limit
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 8MiB PATCH chunks to the resumable endpoint
 
 @st.cache_data(ttl=300)
 def fetch_songs(skip=0, limit=PAGE_SIZE):
-    """Fetch song list from the API with pagination."""
+    """Fetch a page of songs plus the server-reported total from the API."""
     try:
         logger.info(f"Fetching song list from API (skip={skip}, limit={limit}).")
-        response = requests.get(f"{API_URL}/content/", params={"skip": skip, "limit": limit}, timeout=30)
+        response = http.get(f"{API_URL}/content/", params={"skip": skip, "limit": limit}, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         if isinstance(data, dict) and "content" in data:
             songs = data["content"]
+            total = data.get("total", len(songs))
         elif isinstance(data, list):
             songs = data
+            total = len(songs)
         else:
             logger.error(f"Unexpected API response format: {data}")
-            return []
-        
-        logger.success(f"Fetched {len(songs)} songs from the database.")
-        return songs
+            return 0, []
+
+        logger.success(f"Fetched {len(songs)} of {total} songs from the database.")
+        return total, songs
     except requests.RequestException as e:
         logger.error(f"Failed to fetch songs: {e}")
         st.error("Error fetching songs. Please try again later.")
-        return []
+        return 0, []
+
+@st.cache_data(max_entries=1024)
+def _render_song_md(song_id: int, title: str, file_path: str) -> str:
+    """Pure per-song markdown, memoized so reruns skip the string building."""
+    return f"**🎵 Title:** {title}\n\n📁 **Folder Path:** `{file_path}`"
+
+
+@st.cache_data(max_entries=1024)
+def _render_metadata_json(song_id: int, metadata_json: str) -> str:
+    """Pretty-print a song's metadata, memoized by song id."""
+    return json.dumps(json.loads(metadata_json), indent=2, sort_keys=True)
+
 
 def display_songs():
     """Display songs grouped by artist and album with pagination."""
-    songs = fetch_songs(st.session_state.page * PAGE_SIZE, PAGE_SIZE)
+    # Pagination State
+    if "page" not in st.session_state:
+        st.session_state.page = 0
+
+    total, songs = fetch_songs(st.session_state.page * PAGE_SIZE, PAGE_SIZE)
     if not songs:
         st.info("No songs found in the library.")
         return
 
-    total_songs = len(songs)
-    total_pages = (total_songs + PAGE_SIZE - 1) // PAGE_SIZE
-
-    # Pagination State
-    if "page" not in st.session_state:
-        st.session_state.page = 0
+    # Server-reported total drives the page count (the page itself is only PAGE_SIZE rows)
+    total_pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
 
     # Pagination Controls
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -61,57 +77,92 @@ def display_songs():
             st.rerun()
 
     st.subheader(f"📚 Song Library (Page {st.session_state.page + 1}/{total_pages})")
-    
-    songs.sort(key=lambda s: (s.get('artist', 'N/A').lower(),
-                              s.get('album', 'N/A').lower(),
-                              s.get('title', 'N/A').lower()))
-    
-    for artist, artist_group in itertools.groupby(songs, key=lambda s: s.get('artist', 'N/A')):
-        st.markdown(f"## 🎸 {artist}")
-        artist_songs = list(artist_group)
-        for album, album_group in itertools.groupby(artist_songs, key=lambda s: s.get('album', 'N/A')):
+
+    # Rows arrive sorted by artist/album/title from SQL, so one linear pass
+    # emits group headers whenever artist/album change — no groupby/list copies
+    prev_artist = prev_album = None
+    for song in songs:
+        artist = song.get("artist", "N/A")
+        album = song.get("album", "N/A")
+        if artist != prev_artist:
+            st.markdown(f"## 🎸 {artist}")
+            prev_artist = artist
+            prev_album = None
+        if album != prev_album:
             st.markdown(f"### 📀 {album}")
-            for song in album_group:
-                with st.container():
-                    st.markdown(f"**🎵 Title:** {song.get('title', 'N/A')}")
-                    st.write(f"📁 **Folder Path:** `{song.get('file_path', 'N/A')}`")
-                    metadata = song.get("metadata", {})
-                    if metadata:
-                        with st.expander("🔍 Show Metadata"):
-                            st.json(metadata, expanded=False)
-                st.write("---")
+            prev_album = album
+        song_id = song.get("id", 0)
+        with st.container():
+            st.markdown(_render_song_md(song_id, song.get("title", "N/A"), song.get("file_path", "N/A")))
+            metadata = song.get("metadata", {})
+            if metadata:
+                with st.expander("🔍 Show Metadata"):
+                    st.code(_render_metadata_json(song_id, json.dumps(metadata, sort_keys=True)), language="json")
+        st.write("---")
+
+def _upload_resumable(uploaded_file, progress_bar):
+    """Send a file to the API in 8MiB chunks via the resumable /uploads/ endpoints.
+
+    Each chunk is a small PATCH body instead of one multi-gigabyte multipart
+    POST, and a dropped connection resumes from the server-reported offset
+    (HEAD) rather than restarting the whole transfer.
+    """
+    response = http.post(
+        f"{API_URL}/uploads/",
+        headers={
+            "Upload-Length": str(uploaded_file.size),
+            "Upload-Filename": uploaded_file.name,
+            "Upload-Content-Type": "songs",
+        },
+        timeout=30,
+    )
+    response.raise_for_status()
+    location = response.json()["location"]
+
+    offset = 0
+    uploaded_file.seek(0)
+    while offset < uploaded_file.size:
+        chunk = uploaded_file.read(UPLOAD_CHUNK_SIZE)
+        try:
+            response = http.patch(
+                f"{API_URL}{location}",
+                data=chunk,
+                headers={
+                    "Upload-Offset": str(offset),
+                    "Content-Type": "application/offset+octet-stream",
+                },
+                timeout=120,
+            )
+            response.raise_for_status()
+            offset = int(response.headers.get("Upload-Offset", offset + len(chunk)))
+        except requests.RequestException:
+            # Resume from wherever the server says it got to
+            head = http.head(f"{API_URL}{location}", timeout=10)
+            head.raise_for_status()
+            offset = int(head.headers["Upload-Offset"])
+            uploaded_file.seek(offset)
+        progress_bar.progress(min(offset / uploaded_file.size, 1.0))
+
 
 def upload_song():
     """Handles song upload UI."""
     st.header("📤 Upload a Song")
     uploaded_file = st.file_uploader("Choose a .zip or .rar file", type=ALLOWED_EXTENSIONS)
-    
+
     if uploaded_file:
         if uploaded_file.size > MAX_FILE_SIZE_BYTES:
             st.error(f"File size exceeds {MAX_FILE_SIZE_GB}GB limit.")
             return
-        
+
         logger.info(f"Uploading file: {uploaded_file.name}")
-        
-        files = {"file": (uploaded_file.name, uploaded_file, "application/octet-stream")}
-        data = {"content_type": "songs"}  # Ensure this matches the API expectation
 
+        progress_bar = st.progress(0.0)
         with st.spinner("Uploading song..."):
             try:
-                response = requests.post(f"{API_URL}/upload_content/", files=files, data=data, timeout=300)
-                
-                if response.status_code == 200:
-                    resp_json = response.json()
-                    if "error" in resp_json:
-                        st.error(f"Upload error: {resp_json['error']}")
-                        logger.error(f"Upload error: {resp_json['error']}")
-                    else:
-                        st.success("✅ Song uploaded successfully!")
-                        logger.success(f"Successfully uploaded: {uploaded_file.name}")
-                        st.rerun()
-                else:
-                    st.error(f"Upload failed: {response.text}")
-                    logger.error(f"Upload failed: {uploaded_file.name}, Status Code: {response.status_code}")
+                _upload_resumable(uploaded_file, progress_bar)
+                st.success("✅ Song uploaded! Processing continues in the background.")
+                logger.success(f"Successfully uploaded: {uploaded_file.name}")
+                st.rerun()
             except Exception as e:
                 display_exception(e, f"An error occurred while uploading {uploaded_file.name}")
 
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, File, UploadFile, Form, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
 import os
+import asyncio
 import aiofiles
+from aiofiles.os import remove as aio_remove
 import tempfile
-import uuid
-import httpx
 from loguru import logger
 from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pydantic import BaseModel
+from src.services.cache import SWRCache, conditional_json
+from src.services.jobs import create_job, update_job, get_job
 from src.services.content_manager import process_and_store_content
 from src.services.content_utils import extract_content, list_all_content
 
@@ -26,9 +29,16 @@ MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_GB * 1024 * 1024 * 1024
 
 
 def get_temp_file(file_name: str) -> str:
-    """Returns a secure temp file path in the system temp directory."""
-    temp_dir = tempfile.gettempdir()
-    return os.path.join(temp_dir, f"{uuid.uuid4().hex}_{file_name}")
+    """Create a unique temp file and return its path.
+
+    NamedTemporaryFile creates the file with a single O_CREAT|O_EXCL open, so
+    uniqueness is kernel-guaranteed — no separate uuid + open pair. The original
+    name rides along as the suffix because extraction dispatches on extension.
+    (O_TMPFILE would drop the cleanup bookkeeping too, but the extractors need
+    a real path.)
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file_name}") as tmp:
+        return tmp.name
 
 
 def validate_file_extension(file_name: str):
@@ -38,85 +48,159 @@ def validate_file_extension(file_name: str):
         raise HTTPException(status_code=400, detail=f"Invalid file extension: {ext}")
 
 
-async def validate_file_size(file: UploadFile):
-    """Check if uploaded file exceeds the allowed size limit."""
-    size = 0
-    chunk_size = 1024 * 1024  # 1MB chunks
-    while chunk := await file.read(chunk_size):
-        size += len(chunk)
-        if size > MAX_FILE_SIZE_BYTES:
-            raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE_GB}GB)")
-    file.file.seek(0)  # Reset pointer after checking
-
+def _sendfile_copy(in_fd: int, out_fd: int) -> int:
+    """Copy a whole file in-kernel via os.sendfile; returns bytes copied."""
+    total = 0
+    while True:
+        sent = os.sendfile(out_fd, in_fd, total, 1 << 20)
+        if sent == 0:
+            return total
+        total += sent
 
-@router.post("/upload_content/", summary="Upload Clone Hero Content", tags=["Upload"])
-async def upload_content(
-    request: Request,
-    file: UploadFile = File(...),
-    content_type: str = Form(...)
-) -> Dict[str, Any]:  # Ensure return type is Dict
-    if content_type not in ALLOWED_CONTENT_TYPES:
-        raise HTTPException(status_code=400, detail=f"Invalid content type: {content_type}")
 
-    await validate_file_size(file)
-    validate_file_extension(file.filename)
-    temp_file_path = get_temp_file(file.filename)
+async def persist_upload(file: UploadFile, dest_path: str, max_bytes: int = MAX_FILE_SIZE_BYTES, chunk_size: int = 65536):
+    """Persist an UploadFile to dest_path, enforcing the size limit.
 
-    logger.info(f"📤 Received upload for {content_type}, file={file.filename}")
+    Large uploads spill Starlette's SpooledTemporaryFile to a real file; for
+    those the copy runs in-kernel via os.sendfile on a worker thread, avoiding
+    per-chunk Python allocations. Small in-memory uploads stream through a
+    bounded async chunk loop.
+    """
+    if getattr(file.file, "_rolled", False):
+        size = os.fstat(file.file.fileno()).st_size
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE_GB}GB)")
+        out_fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            await run_in_threadpool(_sendfile_copy, file.file.fileno(), out_fd)
+        finally:
+            os.close(out_fd)
+        return
 
-    try:
-        async with aiofiles.open(temp_file_path, "wb") as buffer:
-            while chunk := await file.read(65536):  # Read in 64KB chunks
-                await buffer.write(chunk)
+    size = 0
+    async with aiofiles.open(dest_path, "wb") as buffer:
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE_GB}GB)")
+            await buffer.write(chunk)
 
-        logger.info(f"✅ File saved temporarily at: {temp_file_path}")
 
-        # Extract content and process files
+async def _run_process(job_id: str, temp_file_path: str, content_type: str):
+    """Extract and store uploaded content in the background, tracking job state."""
+    await asyncio.to_thread(update_job, job_id, "processing")
+    try:
         result = await extract_content(temp_file_path, content_type)
 
         # If songs, process further
         if content_type == "songs":
             result = await process_and_store_content(temp_file_path, content_type)
 
+        if isinstance(result, list):  # process_and_store_content returns the stored songs
+            result = {"status": "success", "songs": result}
+
         if not isinstance(result, dict):  # Ensure result is a dictionary
             raise ValueError(f"Invalid response format from processing functions: {result}")
 
-        return result
+        if "error" in result:
+            await asyncio.to_thread(update_job, job_id, "failed", error=result["error"])
+            return
+
+        content_cache.invalidate()  # New content should show up on the next listing
+        await asyncio.to_thread(update_job, job_id, "done", result=result)
 
     except Exception as e:
-        logger.exception(f"❌ Error processing file {file.filename}: {e}")
-        return {"status": "error", "message": "Internal Server Error"}
-    
+        logger.exception(f"❌ Error processing job {job_id}: {e}")
+        await asyncio.to_thread(update_job, job_id, "failed", error=str(e))
+
     finally:
         try:
-            os.remove(temp_file_path)
+            await aio_remove(temp_file_path)
             logger.info(f"🗑️ Removed temporary file: {temp_file_path}")
         except FileNotFoundError:
             pass
 
+
+@router.post("/upload_content/", status_code=202, summary="Upload Clone Hero Content", tags=["Upload"])
+async def upload_content(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    content_type: str = Form(...)
+) -> Dict[str, Any]:  # Ensure return type is Dict
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid content type: {content_type}")
+
+    validate_file_extension(file.filename)
+
+    # Fail fast on the declared request size before consuming any bytes;
+    # persist_upload still enforces the limit on the actual stream.
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FILE_SIZE_BYTES:
+        raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE_GB}GB)")
+
+    temp_file_path = get_temp_file(file.filename)
+
+    logger.info(f"📤 Received upload for {content_type}, file={file.filename}")
+
+    try:
+        # Single streamed pass (kernel copy for spilled files), size limit enforced inline
+        await persist_upload(file, temp_file_path)
+    except HTTPException:
+        try:
+            await aio_remove(temp_file_path)
+        except FileNotFoundError:
+            pass
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Error saving file {file.filename}: {e}")
+        try:
+            await aio_remove(temp_file_path)
+        except FileNotFoundError:
+            pass
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    logger.info(f"✅ File saved temporarily at: {temp_file_path}")
+
+    # Extraction and DB writes are minutes-long for big song packs; run them
+    # after the response so the request only covers bytes on the wire.
+    # The background task owns the temp file from here on.
+    job_id = await asyncio.to_thread(create_job)
+    background_tasks.add_task(_run_process, job_id, temp_file_path, content_type)
+    return {"job_id": job_id, "status_url": f"/jobs/{job_id}", "state": "queued"}
+
+
+@router.get("/jobs/{job_id}", summary="Upload Job Status", tags=["Upload"])
+async def job_status(job_id: str) -> Dict[str, Any]:
+    """Report the state of a background processing job."""
+    job = await asyncio.to_thread(get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return {"job_id": job_id, "state": job["state"], "result": job["result"], "error": job["error"]}
+
 class URLDownloadRequest(BaseModel):
     url: str
 
 
-@router.post("/download/", summary="Download and Extract Content", tags=["Download"])
-async def download_and_extract(request: URLDownloadRequest) -> Dict[str, Any]:
-    """
-    Download an archive (zip/rar) from a provided URL, save it temporarily,
-    process it by extracting its content, and return the result.
-    """
-    file_name = request.url.split("/")[-1]  # Extract filename from URL
+class URLBatchDownloadRequest(BaseModel):
+    urls: List[str]
+
+
+async def _download_one(client, url: str) -> Dict[str, Any]:
+    """Download an archive from url, extract it, and clean up the temp file."""
+    file_name = url.split("/")[-1]  # Extract filename from URL
     validate_file_extension(file_name)
 
     temp_file_path = get_temp_file(file_name)
-    logger.info(f"Downloading file from: {request.url}")
+    logger.info(f"Downloading file from: {url}")
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(request.url, timeout=60)
+        # Stream 64KB chunks straight to disk instead of buffering the archive in RAM
+        async with client.stream("GET", url, timeout=60) as response:
             response.raise_for_status()
-
             async with aiofiles.open(temp_file_path, "wb") as f:
-                await f.write(response.content)
+                async for chunk in response.aiter_bytes(65536):
+                    await f.write(chunk)
 
         logger.info(f"✅ File downloaded to: {temp_file_path}")
 
@@ -124,38 +208,87 @@ async def download_and_extract(request: URLDownloadRequest) -> Dict[str, Any]:
         result = await extract_content(temp_file_path, "songs")
 
         # If songs, process them into the database
-        if "songs" in request.url:
+        if "songs" in url:
             result = await process_and_store_content(temp_file_path, "songs")
 
+        content_cache.invalidate()  # New content should show up on the next listing
         return result
 
-    except Exception as e:
-        logger.exception(f"❌ Download failed for {request.url}: {e}")
-        raise HTTPException(status_code=500, detail="Download failed")
-
     finally:
         try:
-            os.remove(temp_file_path)
+            await aio_remove(temp_file_path)
             logger.info(f"🗑️ Removed temporary file: {temp_file_path}")
         except FileNotFoundError:
             pass
 
 
+@router.post("/download/", summary="Download and Extract Content", tags=["Download"])
+async def download_and_extract(payload: URLDownloadRequest, request: Request) -> Dict[str, Any]:
+    """
+    Download an archive (zip/rar) from a provided URL, save it temporarily,
+    process it by extracting its content, and return the result.
+    """
+    try:
+        # Reuse the app-wide client so repeated downloads share keep-alive connections
+        return await _download_one(request.app.state.http, payload.url)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Download failed for {payload.url}: {e}")
+        raise HTTPException(status_code=500, detail="Download failed")
+
+
+@router.post("/download_batch/", summary="Download and Extract a Batch of URLs", tags=["Download"])
+async def download_batch(payload: URLBatchDownloadRequest, request: Request) -> Dict[str, Any]:
+    """
+    Download and extract several archives concurrently. At most 8 downloads
+    run at once (the shared client's keep-alive pool absorbs the rest), each
+    bounded by a per-URL timeout so one dead mirror can't stall the batch.
+    """
+    client = request.app.state.http
+    semaphore = asyncio.Semaphore(8)
+
+    async def _bounded(url: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(_download_one(client, url), timeout=300)
+                return {"url": url, "status": "success", "result": result}
+            except Exception as e:
+                logger.error(f"❌ Batch download failed for {url}: {e}")
+                return {"url": url, "status": "error", "error": str(e)}
+
+    results = await asyncio.gather(*(_bounded(url) for url in payload.urls))
+    failed = sum(1 for r in results if r["status"] == "error")
+    return {"total": len(results), "failed": failed, "results": results}
+
+
+# Short-TTL SWR cache so bursts of identical page views don't re-query the DB
+content_cache = SWRCache(ttl=10, stale_ttl=60)
+
+
 @router.get("/content/", summary="List All Content", tags=["Content"])
-async def list_content(skip: int = 0, limit: int = 10) -> Dict[str, Any]:
+async def list_content(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=500),  # Cap page size; bulk reads stream server-side
+):
     """
     List all stored content (songs, backgrounds, highways, colors) with pagination.
     """
-    try:
-        content = await list_all_content()  # Run DB query asynchronously
-        paginated_content = content[skip: skip + limit]
+    async def _load() -> Dict[str, Any]:
+        # One round trip: the page rows carry the windowed total
+        content, total = await list_all_content(skip, limit)
 
         return {
-            "total": len(content),
-            "returned": len(paginated_content),
-            "content": paginated_content
+            "total": total,
+            "returned": len(content),
+            "content": content
         }
 
+    try:
+        payload = await content_cache.get(("content", skip, limit), _load)
+        return conditional_json(request, payload)
+
     except Exception as e:
         logger.exception("❌ Error listing content")
         raise HTTPException(status_code=500, detail="Failed to fetch content")
\ No newline at end of file
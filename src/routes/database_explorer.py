@@ -1,24 +1,38 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+from src.services.cache import SWRCache, conditional_json
 from src.services.database_explorer import get_all_songs, delete_song_by_id
 from loguru import logger
 
 router = APIRouter()
 
+# Short-TTL SWR cache so repeated identical page/search views skip the DB
+songs_cache = SWRCache(ttl=10, stale_ttl=60)
+
 @router.get("/songs/")
 async def fetch_songs(
+    request: Request,
     search: str = Query(None, title="Search Query", description="Filter by title, artist, or album"),
     limit: int = Query(50, ge=1, le=100, title="Limit", description="Number of results to return"),
     offset: int = Query(0, ge=0, title="Offset", description="Pagination offset")
 ):
     """Fetch all songs from the database with optional search and pagination."""
-    try:
-        songs = get_all_songs(search_query=search.strip() if search else None, limit=limit, offset=offset)
-        total_songs = len(songs)
-        
+    search_query = search.strip() if search else None
+
+    async def _load():
+        # psycopg2 is sync; keep the query off the event loop
+        songs, total_songs = await run_in_threadpool(
+            get_all_songs, search_query=search_query, limit=limit, offset=offset
+        )
+
         if total_songs == 0:
             return {"message": "⚠️ No songs found.", "total": 0, "songs": []}
-        
+
         return {"total": total_songs, "songs": songs}
+
+    try:
+        payload = await songs_cache.get(("songs", search_query, limit, offset), _load)
+        return conditional_json(request, payload)
     except Exception as e:
         logger.exception(f"❌ Error fetching songs: {e}")
         raise HTTPException(status_code=500, detail="Error fetching songs")
@@ -27,11 +41,12 @@ async def fetch_songs(
 async def delete_song(song_id: int):
     """Delete a song by ID from the database, ensuring it exists before deletion."""
     try:
-        deleted = delete_song_by_id(song_id)
+        deleted = await run_in_threadpool(delete_song_by_id, song_id)
         if not deleted:
             logger.warning(f"⚠️ Attempted to delete non-existent song ID {song_id}.")
             raise HTTPException(status_code=404, detail="Song not found")
-        
+
+        songs_cache.invalidate()  # Deleted songs must not linger in cached pages
         return {"message": f"✅ Song ID {song_id} deleted successfully."}
     except Exception as e:
         logger.exception(f"❌ Error deleting song ID {song_id}: {e}")
@@ -1,3 +1,4 @@
+import asyncio
 import time
 from fastapi import APIRouter, HTTPException
 from loguru import logger
@@ -13,12 +14,16 @@ def get_service_uptime():
     """Calculate service uptime in seconds."""
     return round(time.time() - SERVICE_START_TIME, 2)
 
-def check_database():
-    """Check if the database is reachable."""
+def _check_database_sync():
+    """SELECT 1 on a pooled connection (sync)."""
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+async def check_database():
+    """Check if the database is reachable, bounded so a stuck DB can't pin the probe path."""
     try:
-        with get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT 1")
+        await asyncio.wait_for(asyncio.to_thread(_check_database_sync), timeout=0.5)
         return True
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -38,7 +43,7 @@ async def health_check():
     try:
         logger.info("Health check endpoint called.")
 
-        db_status = check_database()
+        db_status = await check_database()
         uptime = get_service_uptime()
 
         health_status = {
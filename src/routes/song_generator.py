@@ -1,9 +1,12 @@
+import asyncio
 import os
-import uuid
-import aiofiles
+import tempfile
+from aiofiles.os import remove as aio_remove
 from pathlib import Path
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import FileResponse
 from loguru import logger
+from src.routes.content_manager import persist_upload
 from src.services.song_generator import process_song_file
 
 router = APIRouter()
@@ -13,9 +16,13 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 SUPPORTED_FORMATS = {".mp3", ".ogg", ".wav", ".flac"}
 
+# File size limits
+MAX_FILE_SIZE_GB = int(os.getenv("MAX_FILE_SIZE_GB", 10))
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_GB * 1024 * 1024 * 1024
+
 
 async def save_uploaded_file(uploaded_file: UploadFile) -> Path:
-    """Asynchronously saves an uploaded file with a unique name."""
+    """Asynchronously saves an uploaded file with a unique name, enforcing the size limit."""
     file_ext = Path(uploaded_file.filename).suffix.lower()
 
     if file_ext not in SUPPORTED_FORMATS:
@@ -24,17 +31,18 @@ async def save_uploaded_file(uploaded_file: UploadFile) -> Path:
             detail=f"Invalid file format: {file_ext}. Supported formats: {', '.join(SUPPORTED_FORMATS)}"
         )
 
-    unique_file_name = f"{uuid.uuid4().hex}{file_ext}"
-    file_path = OUTPUT_DIR / unique_file_name
+    # Single O_EXCL open in the output dir; no separate uuid + path-construction step
+    with tempfile.NamedTemporaryFile(dir=OUTPUT_DIR, suffix=file_ext, delete=False) as tmp:
+        file_path = Path(tmp.name)
 
     try:
-        async with aiofiles.open(file_path, "wb") as out_file:
-            while chunk := await uploaded_file.read(1024 * 1024):  # Read in 1MB chunks
-                await out_file.write(chunk)
+        await persist_upload(uploaded_file, str(file_path), max_bytes=MAX_FILE_SIZE_BYTES, chunk_size=1024 * 1024)
 
         logger.info(f"📥 Uploaded song saved: {file_path}")
         return file_path
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error saving file {uploaded_file.filename}: {e}")
         raise HTTPException(status_code=500, detail="Error saving uploaded file.")
@@ -47,14 +55,19 @@ async def process_song(file: UploadFile = File(...)):
 
     try:
         logger.info(f"🎵 Processing song: {file.filename}")
-        result = await process_song_file(str(temp_file_path))
+        # process_song_file is sync (librosa number crunching); run it on a
+        # worker thread so the event loop keeps serving other requests
+        result = await asyncio.to_thread(process_song_file, str(temp_file_path))
 
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
 
+        song_dir = Path(result["notes_chart"]).parent.name
         return {
             "message": "Song processed successfully",
             "notes_chart": result["notes_chart"],
+            # Direct download link so clients fetch the chart from the API
+            "notes_chart_url": f"/generator/notes/{song_dir}",
             "tempo": result["tempo"],
             "file_name": file.filename
         }
@@ -66,7 +79,16 @@ async def process_song(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail="Internal server error during song processing.")
     finally:
         try:
-            os.remove(temp_file_path)
+            await aio_remove(temp_file_path)
             logger.info(f"🗑️ Removed temporary song file: {temp_file_path}")
         except FileNotFoundError:
-            pass
\ No newline at end of file
+            pass
+
+
+@router.get("/generator/notes/{song_name}")
+async def download_notes_chart(song_name: str):
+    """Serve a generated notes.chart straight from disk via FileResponse."""
+    notes_path = (OUTPUT_DIR / song_name / "notes.chart").resolve()
+    if OUTPUT_DIR.resolve() not in notes_path.parents or not notes_path.is_file():
+        raise HTTPException(status_code=404, detail="notes.chart not found")
+    return FileResponse(notes_path, media_type="text/plain", filename="notes.chart")
@@ -1,28 +1,35 @@
 import os
-import uuid
-import aiofiles
+import tempfile
+from aiofiles.os import remove as aio_remove
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from loguru import logger
+from src.routes.content_manager import persist_upload
 from src.services.service_manager import process_song, store_content
 
 router = APIRouter()
 
 TEMP_DIR = "/tmp"  # Define temporary directory
 
+# File size limits
+MAX_FILE_SIZE_GB = int(os.getenv("MAX_FILE_SIZE_GB", 10))
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_GB * 1024 * 1024 * 1024
+
 
 async def save_temp_file(file: UploadFile) -> str:
-    """Asynchronously save uploaded file to a temp directory."""
+    """Asynchronously save uploaded file to a temp directory, enforcing the size limit."""
     file_ext = os.path.splitext(file.filename)[-1].lower()
-    temp_file_path = os.path.join(TEMP_DIR, f"{uuid.uuid4().hex}{file_ext}")
+    # Single O_EXCL open; no separate uuid + path-construction step
+    with tempfile.NamedTemporaryFile(dir=TEMP_DIR, suffix=file_ext, delete=False) as tmp:
+        temp_file_path = tmp.name
 
     try:
-        async with aiofiles.open(temp_file_path, "wb") as buffer:
-            while chunk := await file.read(65536):  # Read in 64KB chunks
-                await buffer.write(chunk)
+        await persist_upload(file, temp_file_path, max_bytes=MAX_FILE_SIZE_BYTES)
 
         logger.info(f"📁 File saved temporarily at: {temp_file_path}")
         return temp_file_path
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"❌ Failed to save file: {e}")
         raise HTTPException(status_code=500, detail="Failed to save uploaded file")
@@ -41,7 +48,7 @@ async def upload_song(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail="Error processing song")
     finally:
         try:
-            os.remove(temp_file_path)
+            await aio_remove(temp_file_path)
             logger.info(f"🗑️ Removed temporary song file: {temp_file_path}")
         except FileNotFoundError:
             pass
@@ -60,7 +67,7 @@ async def extract_content(file: UploadFile = File(...), content_type: str = "son
         raise HTTPException(status_code=500, detail="Error extracting content")
     finally:
         try:
-            os.remove(temp_file_path)
+            await aio_remove(temp_file_path)
             logger.info(f"🗑️ Removed temporary extracted file: {temp_file_path}")
         except FileNotFoundError:
             pass
\ No newline at end of file
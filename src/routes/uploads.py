@@ -0,0 +1,242 @@
+import fcntl
+import json
+import os
+import time
+import uuid
+import asyncio
+import tempfile
+from aiofiles.os import remove as aio_remove
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import aiofiles
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request, Response
+from loguru import logger
+
+from src.routes.content_manager import (
+    ALLOWED_CONTENT_TYPES,
+    MAX_FILE_SIZE_BYTES,
+    MAX_FILE_SIZE_GB,
+    content_cache,
+    validate_file_extension,
+)
+from src.services.content_manager import process_and_store_content
+from src.services.content_utils import extract_content
+
+router = APIRouter()
+
+# Session state lives in sidecar files next to the upload data, not in process
+# memory: the API runs several gunicorn workers sharing one filesystem, and a
+# PATCH or HEAD routinely lands on a different worker than the POST that opened
+# the upload. The data file's size is the authoritative offset, so workers
+# never disagree about how many bytes have landed.
+
+# Sessions idle longer than this are swept; abandoned uploads would otherwise
+# leak their temp data and sidecar files forever
+UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", 6 * 3600))
+
+
+def _meta_path(upload_id: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"upload_{upload_id}.meta.json")
+
+
+def _load_session(upload_id: str) -> Optional[Dict[str, Any]]:
+    """Read one upload's metadata sidecar; None for unknown/expired sessions."""
+    if not upload_id.isalnum():
+        return None  # Never let a crafted id reach the filesystem
+    try:
+        with open(_meta_path(upload_id)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_session(upload_id: str, meta: Dict[str, Any]):
+    """Write the metadata sidecar atomically so readers never see a torn file."""
+    path = _meta_path(upload_id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _session_lock(upload_id: str):
+    """Serialize chunk appends for one upload across workers via flock.
+
+    Two PATCHes carrying the same offset would otherwise both pass the offset
+    check and both append; the loser of the flock race gets a 409 and retries
+    from the server-reported offset like any other resume.
+    """
+    lock_file = open(f"{_meta_path(upload_id)}.lock", "w")
+    try:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise HTTPException(status_code=409, detail="Another chunk for this upload is in flight")
+        yield
+    finally:
+        lock_file.close()  # Closing the fd releases the flock
+
+
+def _current_offset(session: Dict[str, Any]) -> int:
+    try:
+        return os.path.getsize(session["path"])
+    except OSError:
+        raise HTTPException(status_code=404, detail="Unknown upload")
+
+
+def _sweep_stale_sessions():
+    """Delete sessions (data + sidecars) whose last chunk landed past the TTL."""
+    cutoff = time.time() - UPLOAD_SESSION_TTL_SECONDS
+    tmp_dir = tempfile.gettempdir()
+    for name in os.listdir(tmp_dir):
+        if not (name.startswith("upload_") and name.endswith(".meta.json")):
+            continue
+        meta_path = os.path.join(tmp_dir, name)
+        data_path = ""
+        try:
+            with open(meta_path) as f:
+                data_path = json.load(f).get("path", "")
+            # The data file's mtime tracks the last append; fall back to the
+            # sidecar for sessions whose data file is already gone
+            last_activity = os.path.getmtime(data_path) if data_path else os.path.getmtime(meta_path)
+        except (OSError, ValueError):
+            last_activity = 0
+        if last_activity > cutoff:
+            continue
+
+        logger.info(f"🧹 Expiring stale resumable upload session: {name}")
+        for path in (data_path, meta_path, f"{meta_path}.lock"):
+            if path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+@router.post("/uploads/", status_code=201, summary="Create Resumable Upload", tags=["Upload"])
+async def create_upload(
+    response: Response,
+    upload_length: int = Header(..., alias="Upload-Length"),
+    file_name: str = Header(..., alias="Upload-Filename"),
+    content_type: str = Header("songs", alias="Upload-Content-Type"),
+) -> Dict[str, Any]:
+    """
+    Open a resumable upload. Clients then PATCH chunks at the current offset and
+    can resume after a dropped connection by asking HEAD for the last offset.
+    """
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid content type: {content_type}")
+    file_name = os.path.basename(file_name)
+    validate_file_extension(file_name)
+    if upload_length <= 0 or upload_length > MAX_FILE_SIZE_BYTES:
+        raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE_GB}GB)")
+
+    # New uploads are rare enough that each one pays for a sweep of the old
+    await asyncio.to_thread(_sweep_stale_sessions)
+
+    upload_id = uuid.uuid4().hex
+    temp_file_path = os.path.join(tempfile.gettempdir(), f"upload_{upload_id}_{file_name}")
+
+    # Pre-create the temp file so PATCH can always append
+    async with aiofiles.open(temp_file_path, "wb"):
+        pass
+
+    _save_session(upload_id, {
+        "path": temp_file_path,
+        "length": upload_length,
+        "content_type": content_type,
+        "file_name": file_name,
+        "completed": False,
+        "created_at": time.time(),
+    })
+
+    location = f"/uploads/{upload_id}"
+    response.headers["Location"] = location
+    logger.info(f"📤 Opened resumable upload {upload_id} for {file_name} ({upload_length} bytes)")
+    return {"upload_id": upload_id, "location": location}
+
+
+@router.head("/uploads/{upload_id}", summary="Resumable Upload Status", tags=["Upload"])
+async def upload_status(upload_id: str) -> Response:
+    """Report the current byte offset so clients can resume where they left off."""
+    session = _load_session(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown upload")
+
+    return Response(
+        status_code=200,
+        headers={
+            "Upload-Offset": str(_current_offset(session)),
+            "Upload-Length": str(session["length"]),
+        },
+    )
+
+
+@router.patch("/uploads/{upload_id}", summary="Append Upload Chunk", tags=["Upload"])
+async def append_chunk(
+    upload_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+) -> Response:
+    """Append one chunk at the declared offset; processing starts when complete."""
+    session = _load_session(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown upload")
+    if session["completed"]:
+        raise HTTPException(status_code=409, detail="Upload already completed")
+
+    with _session_lock(upload_id):
+        offset = _current_offset(session)
+        if upload_offset != offset:
+            raise HTTPException(status_code=409, detail=f"Offset mismatch (server at {offset})")
+
+        # Stream the body straight to disk — request.body() would buffer an
+        # arbitrarily large PATCH in RAM before any size check could run
+        remaining = session["length"] - offset
+        written = 0
+        async with aiofiles.open(session["path"], "ab") as f:
+            async for part in request.stream():
+                written += len(part)
+                if written > remaining:
+                    break
+                await f.write(part)
+
+        if written > remaining:
+            # Roll back the partial append so a corrected retry resumes cleanly
+            await asyncio.to_thread(os.truncate, session["path"], offset)
+            raise HTTPException(status_code=413, detail="Chunk exceeds declared Upload-Length")
+
+        new_offset = offset + written
+
+        if new_offset == session["length"]:
+            session["completed"] = True
+            _save_session(upload_id, session)
+            background_tasks.add_task(_process_completed, upload_id)
+
+    return Response(status_code=204, headers={"Upload-Offset": str(new_offset)})
+
+
+async def _process_completed(upload_id: str):
+    """Extract and store a finished upload, then drop its session and temp file."""
+    session = _load_session(upload_id)
+    if session is None:
+        return
+
+    try:
+        result = await extract_content(session["path"], session["content_type"])
+        if session["content_type"] == "songs":
+            result = await process_and_store_content(session["path"], session["content_type"])
+        content_cache.invalidate()
+        logger.info(f"✅ Resumable upload {upload_id} processed: {session['file_name']} -> {result}")
+    except Exception as e:
+        logger.exception(f"❌ Error processing resumable upload {upload_id}: {e}")
+    finally:
+        meta_path = _meta_path(upload_id)
+        for path in (session["path"], meta_path, f"{meta_path}.lock"):
+            try:
+                await aio_remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,91 @@
+import asyncio
+import hashlib
+import time
+
+import orjson
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from fastapi import Request, Response
+from loguru import logger
+
+# Mirrors the server-side SWR windows so HTTP caches revalidate on the same rhythm
+CACHE_CONTROL = "public, max-age=10, stale-while-revalidate=60"
+
+
+def conditional_json(request: Request, payload: Any) -> Response:
+    """Serialize payload once, tag it with a strong ETag, and honor If-None-Match.
+
+    A matching If-None-Match returns a header-only 304 instead of re-sending
+    the multi-KB listing, so proxies and client HTTP caches can serve repeat
+    page flips without the body.
+    """
+    body = orjson.dumps(payload, default=str)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class SWRCache:
+    """
+    Tiny in-process stale-while-revalidate cache for async loaders.
+
+    Fresh hits return immediately; stale hits return the cached payload and
+    schedule a background refresh; misses (or entries past the stale window)
+    await the loader directly.
+    """
+
+    def __init__(self, ttl: float = 10.0, stale_ttl: float = 60.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._refreshing: set = set()
+        self._tasks: set = set()  # Strong refs; the loop only holds weak ones
+        self._generation = 0  # Bumped by invalidate() to fence in-flight refreshes
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached payload for key, refreshing per SWR semantics."""
+        entry = self._entries.get(key)
+        if entry:
+            cached_at, payload = entry
+            age = time.monotonic() - cached_at
+            if age < self.ttl:
+                return payload
+            if age < self.ttl + self.stale_ttl:
+                self._schedule_refresh(key, loader)
+                return payload
+
+        payload = await loader()
+        self._entries[key] = (time.monotonic(), payload)
+        return payload
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        """Kick off at most one background refresh per key."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        generation = self._generation
+
+        async def _refresh():
+            try:
+                payload = await loader()
+                # Skip the store if invalidate() ran mid-flight — this payload
+                # predates the write and would resurrect deleted/stale data
+                if generation == self._generation:
+                    self._entries[key] = (time.monotonic(), payload)
+            except Exception as e:
+                logger.warning(f"⚠️ Cache refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        # Keep a strong reference until done: a task the loop only weakly
+        # holds can be GC'd mid-flight, stranding key in _refreshing
+        task = asyncio.create_task(_refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def invalidate(self):
+        """Drop all cached entries (call after writes)."""
+        self._generation += 1  # Fences refreshes already loading pre-write data
+        self._entries.clear()
+        self._refreshing.clear()
@@ -1,12 +1,28 @@
+import asyncio
+import errno
+import functools
 import os
+import re
 import shutil
 import uuid
-import configparser
 from pathlib import Path
+from typing import Optional, Tuple
 from loguru import logger
 from typing import List, Dict, Any
 from src.database import get_connection
-from psycopg2.extras import Json, DictCursor
+from psycopg2.extras import Json, execute_values
+
+# Column order shared by the catalog SELECTs; rows arrive as plain tuples
+_SONG_COLS = ("id", "title", "artist", "album", "file_path", "metadata")
+
+
+def song_row_to_dict(row) -> Dict[str, Any]:
+    """Build a song dict from a tuple row, normalizing NULL metadata to {}."""
+    song = dict(zip(_SONG_COLS, row))
+    if not song["metadata"]:
+        song["metadata"] = {}
+    return song
+
 
 # Optional metadata fields for songs
 OPTIONAL_FIELDS = [
@@ -17,136 +33,252 @@ OPTIONAL_FIELDS = [
     "video_start_time", "modchart", "loading_phrase", "delay"
 ]
 
-def parse_song_ini(ini_path: Path) -> Dict[str, Any]:
-    """Parse the song.ini file to retrieve metadata."""
-    config = configparser.ConfigParser()
+# Minimal INI grammar: song.ini never uses interpolation or multiline values,
+# so two regexes replace configparser's per-file machinery for batch ingestion
+_SECTION_RE = re.compile(r'^\[([^\]]+)\]\s*$', re.M)
+_KV_RE = re.compile(r'^\s*([A-Za-z0-9_]+)\s*=\s*(.*?)\s*$', re.M)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_song_ini_cached(path_str: str, mtime_ns: int, size: int) -> Optional[Tuple]:
+    """Parse one song.ini into an immutable tuple form, memoized by file identity.
+
+    mtime_ns and size only participate in the cache key, so a touched or
+    rewritten file reparses automatically while rescans of an unchanged tree
+    collapse to a dict lookup.
+    """
+    ini_path = Path(path_str)
     try:
-        with ini_path.open("r", encoding="utf-8-sig") as f:
-            config.read_file(f)
+        text = ini_path.read_bytes().decode("utf-8-sig", "replace")
     except Exception as e:
         logger.error(f"❌ Failed to read {ini_path}: {e}")
-        return {}
+        return None
+
+    # Slice out the [song] block: from its header to the next section (or EOF)
+    song_block = None
+    sections = list(_SECTION_RE.finditer(text))
+    for i, match in enumerate(sections):
+        if match.group(1).strip().lower() == "song":
+            end = sections[i + 1].start() if i + 1 < len(sections) else len(text)
+            song_block = text[match.end():end]
+            break
 
-    if not config.has_section("song"):
+    if song_block is None:
         logger.warning(f"⚠️ Missing [song] section in {ini_path}")
-        return {}
+        return None
+
+    values = {key.lower(): value for key, value in _KV_RE.findall(song_block)}
 
-    name = config.get("song", "name", fallback=None)
-    artist = config.get("song", "artist", fallback=None)
-    album = config.get("song", "album", fallback=None)
+    name = values.get("name")
+    artist = values.get("artist")
+    album = values.get("album")
 
     if not name or not artist or not album:
         logger.warning(f"⚠️ Missing required fields in {ini_path}, skipping file.")
+        return None
+
+    metadata = tuple(
+        (field, values[field].strip())
+        for field in OPTIONAL_FIELDS if values.get(field)
+    )
+
+    return (name.strip(), artist.strip(), album.strip(), metadata)
+
+
+def parse_song_ini(ini_path: Path) -> Dict[str, Any]:
+    """Parse the song.ini file to retrieve metadata (cached by path/mtime/size)."""
+    try:
+        stat = ini_path.stat()
+    except OSError as e:
+        logger.error(f"❌ Failed to stat {ini_path}: {e}")
         return {}
 
-    metadata = {
-        field: config.get("song", field, fallback=None)
-        for field in OPTIONAL_FIELDS if config.has_option("song", field)
-    }
+    parsed = _parse_song_ini_cached(str(ini_path), stat.st_mtime_ns, stat.st_size)
+    if parsed is None:
+        return {}
 
+    title, artist, album, metadata = parsed
     return {
-        "title": name.strip(),
-        "artist": artist.strip(),
-        "album": album.strip(),
-        "metadata": {k: v.strip() for k, v in metadata.items() if v is not None}
+        "title": title,
+        "artist": artist,
+        "album": album,
+        "metadata": dict(metadata)
     }
 
-def add_content_to_db(title: str, artist: str, album: str, file_path: str, metadata: dict = None) -> int:
-    """Insert content into the database and return its ID."""
-    metadata = metadata or {}
+def insert_songs_batch(rows: List[Tuple[str, str, str, str, dict]]) -> List[int]:
+    """Insert (title, artist, album, file_path, metadata) rows in one transaction.
+
+    One execute_values INSERT with ON CONFLICT (title, artist, album) DO
+    NOTHING lands the whole archive atomically against the songs_tau_uq unique
+    index — no SELECT-then-INSERT race and usually a single round trip; only
+    batches containing duplicates pay one follow-up SELECT for the existing
+    ids. Returns an id per input row, -1 for a row whose batch failed.
+    """
+    if not rows:
+        return []
+
+    keys = [(title, artist, album) for title, artist, album, _, _ in rows]
 
     try:
         with get_connection() as conn:
-            with conn.cursor(cursor_factory=DictCursor) as cursor:
-                cursor.execute(
-                    "SELECT id FROM songs WHERE title = %s AND artist = %s AND album = %s",
-                    (title, artist, album)
-                )
-                existing_song = cursor.fetchone()
-                if existing_song:
-                    logger.warning(f"⚠️ Duplicate detected, skipping insert: {file_path}")
-                    return existing_song[0]
+            with conn.cursor() as cursor:
+                to_insert = []
+                queued = set()
+                for title, artist, album, file_path, metadata in rows:
+                    key = (title, artist, album)
+                    if key in queued:
+                        logger.warning(f"⚠️ Duplicate detected, skipping insert: {file_path}")
+                        continue
+                    queued.add(key)
+                    to_insert.append((title, artist, album, file_path, Json(metadata or {})))
 
-                cursor.execute(
+                returned = execute_values(
+                    cursor,
                     """
-                    INSERT INTO songs (title, artist, album, file_path, metadata)
-                    VALUES (%s, %s, %s, %s, %s) RETURNING id
+                    INSERT INTO songs (title, artist, album, file_path, metadata) VALUES %s
+                    ON CONFLICT (title, artist, album) DO NOTHING
+                    RETURNING id, title, artist, album
                     """,
-                    (title, artist, album, file_path, Json(metadata))
+                    to_insert,
+                    fetch=True,
                 )
-                content_id = cursor.fetchone()[0]
+                ids = {(r[1], r[2], r[3]): r[0] for r in returned}
+
+                # Conflicting rows return nothing; fetch their pre-existing ids
+                missing = [key for key in queued if key not in ids]
+                if missing:
+                    logger.warning(f"⚠️ {len(missing)} duplicates already stored, reusing existing ids")
+                    cursor.execute(
+                        "SELECT id, title, artist, album FROM songs WHERE (title, artist, album) IN %s",
+                        (tuple(missing),)
+                    )
+                    ids.update({(r[1], r[2], r[3]): r[0] for r in cursor.fetchall()})
+
                 conn.commit()
 
-        logger.success(f"✅ Content added: {title} - {artist} ({album})")
-        return content_id
+        logger.success(f"✅ Stored {len(returned)} new songs ({len(rows) - len(returned)} duplicates skipped)")
+        return [ids.get(key, -1) for key in keys]
     except Exception as e:
-        logger.exception(f"❌ Error inserting content: {e}")
-        return -1
+        logger.exception(f"❌ Error batch-inserting content: {e}")
+        return [-1] * len(rows)
+
+def _move_dir(src: str, dst: str):
+    """Move a song folder, preferring an atomic same-filesystem rename.
+
+    Extraction happens on the content volume, so os.rename normally succeeds
+    in one syscall; shutil.move's recursive copy+delete only runs as the
+    cross-device (EXDEV) fallback.
+    """
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+
+def _find_song_inis(root: Path) -> List[Path]:
+    """Locate song.ini files with an os.scandir walk.
+
+    A folder holding a song.ini is a complete chart — nothing beneath it can
+    contain another one — so the walk stops descending there instead of
+    statting every audio/image asset the way rglob("song.ini") does.
+    """
+    found = []
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.warning(f"⚠️ Skipping unreadable directory {current}: {e}")
+            continue
+
+        ini = next((e for e in entries if e.name.lower() == "song.ini" and e.is_file()), None)
+        if ini is not None:
+            found.append(Path(ini.path))
+            continue  # Short-circuit: don't descend below a song folder
+
+        stack.extend(e.path for e in entries if e.is_dir(follow_symlinks=False))
+    return found
+
 
 async def process_and_store_content(temp_extract_dir: str, content_type: str) -> List[Dict[str, Any]]:
     """Process and store content, including songs and visual assets."""
     from src.services.content_utils import get_final_directory  # Import inside function to prevent circular imports
 
-    stored_content = []
     temp_extract_dir = Path(temp_extract_dir)
+    ini_paths = await asyncio.to_thread(_find_song_inis, temp_extract_dir)
 
-    for ini_path in temp_extract_dir.rglob("song.ini"):
-        parsed = parse_song_ini(ini_path)
-        if not parsed:
-            continue  # Skip if parsing failed
+    # Parse and move songs concurrently (each step is blocking I/O, so it runs
+    # on worker threads), bounded so a huge pack doesn't swamp the disk
+    semaphore = asyncio.Semaphore(8)
 
-        title, artist, album, metadata = parsed["title"], parsed["artist"], parsed["album"], parsed["metadata"]
+    async def _prepare(ini_path: Path):
+        """Parse one song and move its folder into place; returns a DB row or None."""
+        async with semaphore:
+            parsed = await asyncio.to_thread(parse_song_ini, ini_path)
+            if not parsed:
+                return None  # Skip if parsing failed
 
-        # Ensure unique file storage
-        artist_dir = Path(get_final_directory("songs")) / artist
-        artist_dir.mkdir(parents=True, exist_ok=True)
-        final_dir = artist_dir / f"{title}_{uuid.uuid4().hex[:8]}"
+            title, artist, album, metadata = parsed["title"], parsed["artist"], parsed["album"], parsed["metadata"]
+
+            # Ensure unique file storage
+            artist_dir = Path(get_final_directory("songs")) / artist
+            await asyncio.to_thread(artist_dir.mkdir, parents=True, exist_ok=True)
+            final_dir = artist_dir / f"{title}_{uuid.uuid4().hex[:8]}"
+
+            try:
+                await asyncio.to_thread(_move_dir, str(ini_path.parent), str(final_dir))
+            except Exception as e:
+                logger.error(f"❌ Error moving file {ini_path.parent} to {final_dir}: {e}")
+                return None
+            return (title, artist, album, str(final_dir), metadata)
+
+    prepared = await asyncio.gather(*(_prepare(p) for p in ini_paths), return_exceptions=True)
+
+    # Then land every surviving row in one batched insert
+    rows = []
+    for item in prepared:
+        if isinstance(item, BaseException):
+            logger.error(f"❌ Error ingesting song: {item}")
+        elif item is not None:
+            rows.append(item)
+
+    content_ids = await asyncio.to_thread(insert_songs_batch, rows)
+
+    stored_content = []
+    for (title, artist, album, folder_path, metadata), content_id in zip(rows, content_ids):
+        if content_id != -1:
+            stored_content.append({
+                "id": content_id,
+                "title": title,
+                "artist": artist,
+                "album": album,
+                "folder_path": folder_path,
+                "metadata": metadata
+            })
 
-        try:
-            shutil.move(str(ini_path.parent), str(final_dir))
-            content_id = add_content_to_db(title, artist, album, str(final_dir), metadata)
-
-            if content_id != -1:
-                stored_content.append({
-                    "id": content_id,
-                    "title": title,
-                    "artist": artist,
-                    "album": album,
-                    "folder_path": str(final_dir),
-                    "metadata": metadata
-                })
-        except Exception as e:
-            logger.error(f"❌ Error moving file {ini_path.parent} to {final_dir}: {e}")
-    
     return stored_content
 
-def fetch_content_from_db(skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
-    """Fetch paginated content from the database."""
-    try:
-        with get_connection() as conn:
-            with conn.cursor(cursor_factory=DictCursor) as cursor:
-                cursor.execute(
-                    """
-                    SELECT id, title, artist, album, file_path, metadata
-                    FROM songs
-                    ORDER BY id DESC
-                    LIMIT %s OFFSET %s
-                    """,
-                    (limit, skip)
-                )
-                content = cursor.fetchall()
-
-        return [
-            {
-                "id": row["id"],
-                "title": row["title"],
-                "artist": row["artist"],
-                "album": row["album"],
-                "file_path": row["file_path"],
-                "metadata": row["metadata"] if row["metadata"] else {}
-            }
-            for row in content
-        ]
-    except Exception as e:
-        logger.exception(f"❌ Error fetching content: {e}")
-        return []
\ No newline at end of file
+def iter_content_from_db(itersize: int = 500):
+    """Stream every stored song through a named server-side cursor.
+
+    For bulk consumers (exports, re-indexing): Postgres holds the result set
+    and ships rows in itersize batches, so memory stays flat no matter how
+    large the catalog grows. Interactive paths should use the paginated
+    list_all_content instead.
+    """
+    with get_connection() as conn:
+        with conn.cursor("iter_all_songs") as cursor:
+            cursor.itersize = itersize
+            cursor.execute(
+                """
+                SELECT id, title, artist, album, file_path, metadata
+                FROM songs
+                ORDER BY id DESC
+                """
+            )
+            for row in cursor:
+                yield song_row_to_dict(row)
\ No newline at end of file
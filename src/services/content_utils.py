@@ -1,18 +1,16 @@
+import functools
 import os
 import shutil
 import zipfile
 import rarfile  # New: RAR extraction fix
 import uuid
-import tempfile
 import asyncio
-import aiofiles
 from pathlib import Path
 from src.database import get_connection
-from psycopg2.extras import DictCursor
 from loguru import logger
 from dotenv import load_dotenv
-from typing import Dict, Any, List
-from src.services.content_manager import process_and_store_content
+from typing import Dict, Any, List, Tuple
+from src.services.content_manager import process_and_store_content, song_row_to_dict
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +21,9 @@ if not CONTENT_BASE_DIR.exists():
     logger.warning("⚠️ CONTENT_BASE_DIR does not exist. Creating it now.")
     CONTENT_BASE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Extensions handled by the archive extractors (membership tests on the upload path)
+_ARCHIVE_EXTS = frozenset({".zip", ".rar"})
+
 CONTENT_FOLDERS = {
     "backgrounds": "backgrounds",
     "colors": "colors",
@@ -32,28 +33,82 @@ CONTENT_FOLDERS = {
     "temp": "temp",
 }
 
-def get_final_directory(content_type: str) -> Path:
-    """Return subfolder path for the given content_type, ensuring the directory exists."""
+@functools.lru_cache(maxsize=None)
+def _final_dir(content_type: str) -> Path:
+    """Resolve and create the subfolder once per content_type per process."""
     subfolder = CONTENT_FOLDERS.get(content_type, content_type)
     final_dir = CONTENT_BASE_DIR / subfolder
     final_dir.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
     return final_dir
 
+
+def get_final_directory(content_type: str) -> Path:
+    """Return subfolder path for the given content_type, ensuring the directory exists.
+
+    The mkdir happens on first use only; repeat calls during ingestion loops
+    are a cache lookup instead of a stat+mkdir pair per song.
+    """
+    return _final_dir(content_type)
+
 async def store_extracted_content(temp_extract_dir: str, content_type: str) -> Dict[str, Any]:
     """Move extracted content to the final directory asynchronously."""
     return await process_and_store_content(temp_extract_dir, content_type)
 
-async def extract_archive(file_path: str, extract_dir: str, file_ext: str) -> Dict[str, Any]:
-    """Extracts .zip or .rar archives using available methods."""
+def _song_member_filter(names: List[str]) -> Any:
+    """Pick the archive members living in folders that contain a song.ini.
+
+    Returns None when a song.ini sits at the archive root (the whole archive
+    is one song, take everything) and an empty list when there is no song.ini
+    at all. Reading only the central directory costs nothing compared to
+    decompressing bundled videos and stems that ingestion would never touch.
+    """
+    song_dirs = set()
+    for name in names:
+        clean = name.replace("\\", "/")
+        if clean.lower().endswith("song.ini"):
+            if "/" not in clean:
+                return None
+            song_dirs.add(clean.rsplit("/", 1)[0] + "/")
+
+    if not song_dirs:
+        return []
+    prefixes = tuple(song_dirs)
+    return [name for name in names if name.replace("\\", "/").startswith(prefixes)]
+
+
+def _extract_zip_sync(file_path: str, extract_dir: str, songs_only: bool = False):
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        members = _song_member_filter(zip_ref.namelist()) if songs_only else None
+        if members is None:
+            zip_ref.extractall(extract_dir)
+        else:
+            zip_ref.extractall(extract_dir, members=members)
+
+
+def _extract_rar_sync(file_path: str, extract_dir: str, songs_only: bool = False):
+    with rarfile.RarFile(file_path) as rar_ref:
+        members = _song_member_filter(rar_ref.namelist()) if songs_only else None
+        if members is None:
+            rar_ref.extractall(extract_dir)
+        else:
+            rar_ref.extractall(extract_dir, members=members)
+
+
+async def extract_archive(file_path: str, extract_dir: str, file_ext: str, content_type: str = "") -> Dict[str, Any]:
+    """Extracts .zip or .rar archives using available methods.
+
+    The extractall calls run in a worker thread — unpacking a multi-GB archive
+    is seconds of blocking I/O that would otherwise freeze the event loop. For
+    songs, only members inside song.ini-bearing folders are written to disk.
+    """
+    songs_only = content_type == "songs"
     try:
         if file_ext == ".zip":
-            with zipfile.ZipFile(file_path, "r") as zip_ref:
-                zip_ref.extractall(extract_dir)
+            await asyncio.to_thread(_extract_zip_sync, file_path, extract_dir, songs_only)
 
         elif file_ext == ".rar":
             try:
-                with rarfile.RarFile(file_path) as rar_ref:
-                    rar_ref.extractall(extract_dir)
+                await asyncio.to_thread(_extract_rar_sync, file_path, extract_dir, songs_only)
             except rarfile.NeedFirstVolume:
                 logger.error(f"🚨 Multi-part RAR archives are not supported: {file_path}")
                 return {"error": "Multi-part RAR archives are not supported"}
@@ -76,21 +131,23 @@ async def extract_content(file_path: str, content_type: str) -> Dict[str, Any]:
     - For `songs`, ensures song content is handled properly.
     - For `backgrounds`, `colors`, `highways`, moves extracted content.
     """
-    file_name = Path(file_path).name
-    temp_extract_dir = Path(tempfile.gettempdir()) / f"extract_{uuid.uuid4().hex[:6]}"
+    path = Path(file_path)
+    file_name = path.name
+    file_ext = path.suffix.lower()
+    # Extract inside the content volume so the later per-song move is an
+    # atomic same-filesystem rename, not a cross-device copy of every asset
+    temp_extract_dir = get_final_directory("temp") / f"extract_{uuid.uuid4().hex[:6]}"
 
     try:
-        file_ext = Path(file_path).suffix.lower()
-
-        if file_ext in [".zip", ".rar"]:
+        if file_ext in _ARCHIVE_EXTS:
             temp_extract_dir.mkdir(parents=True, exist_ok=True)
             logger.info(f"📦 Extracting {file_path} to {temp_extract_dir}")
 
-            extract_result = await extract_archive(file_path, temp_extract_dir, file_ext)
+            extract_result = await extract_archive(file_path, temp_extract_dir, file_ext, content_type)
             if "error" in extract_result:
                 return extract_result
 
-            os.remove(file_path)  # Delete original archive after extraction
+            await asyncio.to_thread(os.remove, file_path)  # Delete original archive after extraction
             return await store_extracted_content(str(temp_extract_dir), content_type)
 
         # Handle direct file storage
@@ -100,7 +157,7 @@ async def extract_content(file_path: str, content_type: str) -> Dict[str, Any]:
         if content_type == "songs":
             return {"error": "⚠️ Please upload a .zip or .rar file containing a song.ini"}
 
-        shutil.move(file_path, str(dst_path))
+        await asyncio.to_thread(shutil.move, file_path, str(dst_path))
         return {"message": f"✅ Stored file: {file_name}", "file": str(dst_path)}
 
     except Exception as e:
@@ -108,28 +165,30 @@ async def extract_content(file_path: str, content_type: str) -> Dict[str, Any]:
         return {"error": str(e)}
 
     finally:
-        shutil.rmtree(temp_extract_dir, ignore_errors=True)  # Cleanup temp dir even on failure
+        # Cleanup temp dir even on failure; recursive rm runs off-loop too
+        await asyncio.to_thread(shutil.rmtree, temp_extract_dir, ignore_errors=True)
 
-async def list_all_content() -> List[Dict[str, Any]]:
-    """List all stored content (songs, backgrounds, highways, colors)."""
+def _list_content_sync(skip: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+    """Fetch one page of stored songs plus the total row count (sync).
+
+    count(*) OVER () rides along on every row, so page and total come back in
+    a single round trip instead of a separate SELECT count(*).
+    """
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            # Server-side prepared statement (see src.database); carries the
+            # windowed total alongside each page row
+            cursor.execute("EXECUTE content_page (%s, %s)", (limit, skip))
+            content = cursor.fetchall()
+
+    total = content[0][-1] if content else 0
+    # Plain tuple rows + one dict(zip(...)) per song: no DictRow wrapper copies
+    return [song_row_to_dict(row) for row in content], total
+
+async def list_all_content(skip: int = 0, limit: int = 50) -> Tuple[List[Dict[str, Any]], int]:
+    """List one page of stored content plus the total, paginated in SQL."""
     try:
-        conn = await asyncio.to_thread(get_connection)  # Ensure connection runs asynchronously
-        async with conn:
-            async with conn.cursor(cursor_factory=DictCursor) as cursor:
-                await cursor.execute("SELECT * FROM songs")
-                content = await cursor.fetchall()
-
-        return [
-            {
-                "id": row["id"],
-                "title": row["title"],
-                "artist": row["artist"],
-                "album": row["album"],
-                "file_path": row["file_path"],
-                "metadata": row["metadata"] if row["metadata"] else {}
-            }
-            for row in content
-        ]
+        return await asyncio.to_thread(_list_content_sync, skip, limit)
     except Exception as e:
         logger.exception(f"❌ Error listing content: {e}")
-        return []  # Always return a list (consistent with function signature)
\ No newline at end of file
+        return [], 0  # Always return the (page, total) shape
\ No newline at end of file
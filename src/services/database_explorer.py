@@ -1,54 +1,47 @@
 from src.database import get_connection
+from src.services.content_manager import song_row_to_dict
 from loguru import logger
-import psycopg2.extras  # For DictCursor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-def get_all_songs(search_query: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-    """Retrieve songs from the database, optionally filtering by search query with pagination."""
+def get_all_songs(search_query: Optional[str] = None, limit: int = 50, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Retrieve a page of songs plus the total matching count, optionally filtered by search query."""
     try:
         with get_connection() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
-                query = "SELECT id, title, artist, album, file_path, metadata FROM songs"
-                params = []
-
+            with conn.cursor() as cursor:
+                # Server-side prepared statements (see src.database); both carry
+                # count(*) OVER () so the full match count comes from the same
+                # scan as the page. The search variant's single ILIKE hits the
+                # ix_songs_trgm GIN index on the concatenated columns.
                 if search_query and search_query.strip():  # Avoid matching everything if empty
-                    query += " WHERE title ILIKE %s OR artist ILIKE %s OR album ILIKE %s"
-                    params.extend([f"%{search_query.strip()}%"] * 3)
-                
-                query += " ORDER BY id DESC LIMIT %s OFFSET %s"
-                params.extend([limit, offset])
-                cursor.execute(query, params)
+                    cursor.execute(
+                        "EXECUTE songs_search (%s, %s, %s)",
+                        (f"%{search_query.strip()}%", limit, offset),
+                    )
+                else:
+                    cursor.execute("EXECUTE songs_page (%s, %s)", (limit, offset))
                 songs = cursor.fetchall()
 
-        return [
-            {
-                "id": row["id"],
-                "title": row["title"],
-                "artist": row["artist"],
-                "album": row["album"],
-                "file_path": row["file_path"],
-                "metadata": row["metadata"] if row["metadata"] else {}
-            }
-            for row in songs
-        ]
+        total = songs[0][-1] if songs else 0
+        # Plain tuple rows + one dict(zip(...)) per song: no DictRow wrapper copies
+        return [song_row_to_dict(row) for row in songs], total
     except Exception as e:
         logger.exception(f"❌ Error fetching songs from database: {e}")
-        return []
+        return [], 0
 
 def delete_song_by_id(song_id: int) -> bool:
     """Delete a song from the database by its ID, ensuring it exists before deletion."""
     try:
         with get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT id FROM songs WHERE id = %s", (song_id,))
+                cursor.execute("EXECUTE song_exists (%s)", (song_id,))
                 song = cursor.fetchone()
 
                 if not song:
                     logger.warning(f"⚠️ Song ID {song_id} not found, cannot delete.")
                     return False
 
-                cursor.execute("DELETE FROM songs WHERE id = %s", (song_id,))
+                cursor.execute("EXECUTE song_delete (%s)", (song_id,))
                 conn.commit()
 
         logger.success(f"✅ Successfully deleted song ID {song_id}")
@@ -0,0 +1,52 @@
+import uuid
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from psycopg2.extras import Json
+
+from src.database import get_connection
+
+# Job state lives in Postgres (processing_jobs, src/sql/schema.sql) rather than
+# a per-worker dict: the API runs several gunicorn workers, so a client polling
+# the status URL rarely lands on the worker that enqueued the job. Finished
+# jobs are swept after a day on the next enqueue. All three helpers are sync
+# (plain psycopg2); async callers run them via asyncio.to_thread.
+
+
+def create_job() -> str:
+    """Register a new queued job and return its id."""
+    job_id = uuid.uuid4().hex
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM processing_jobs WHERE created_at < now() - interval '1 day'")
+            cursor.execute("INSERT INTO processing_jobs (id) VALUES (%s)", (job_id,))
+        conn.commit()
+    return job_id
+
+
+def update_job(job_id: str, state: str, result: Any = None, error: Optional[str] = None):
+    """Record a job's state transition along with its result or error."""
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE processing_jobs SET state = %s, "
+                    "result = COALESCE(%s, result), error = COALESCE(%s, error), "
+                    "updated_at = now() WHERE id = %s",
+                    (state, Json(result) if result is not None else None, error, job_id),
+                )
+            conn.commit()
+    except Exception as e:
+        # A lost transition only degrades the status report; processing goes on
+        logger.exception(f"❌ Failed to update job {job_id}: {e}")
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return a job's status dict, or None if unknown (or already swept)."""
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT state, result, error FROM processing_jobs WHERE id = %s", (job_id,))
+            row = cursor.fetchone()
+    if row is None:
+        return None
+    return {"state": row[0], "result": row[1], "error": row[2]}
@@ -19,7 +19,9 @@ async def store_content(temp_extract_dir: str, content_type: str):
     """Wrapper to process and store extracted content asynchronously."""
     try:
         logger.info(f"📦 Storing extracted content: {content_type} at {temp_extract_dir}")
-        result = await asyncio.to_thread(process_and_store_content, temp_extract_dir, content_type)
+        # process_and_store_content is itself async and offloads its own
+        # blocking steps; wrapping it in to_thread would never run it
+        result = await process_and_store_content(temp_extract_dir, content_type)
         return result
     except Exception as e:
         logger.error(f"❌ Error storing content {content_type} at {temp_extract_dir}: {e}")
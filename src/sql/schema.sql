@@ -1,3 +1,5 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE IF NOT EXISTS songs (
     id SERIAL PRIMARY KEY,
     title TEXT NOT NULL,
@@ -7,4 +9,24 @@ CREATE TABLE IF NOT EXISTS songs (
     metadata JSONB DEFAULT '{}'::JSONB NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Dedupe key for ingestion: lets inserts use ON CONFLICT instead of SELECT-then-INSERT
+CREATE UNIQUE INDEX IF NOT EXISTS songs_tau_uq ON songs (title, artist, album);
+
+-- Trigram index so leading-wildcard ILIKE search doesn't seq-scan the catalog
+CREATE INDEX IF NOT EXISTS ix_songs_trgm ON songs USING gin ((title || ' ' || artist || ' ' || album) gin_trgm_ops);
+
+-- Functional index backing the library listing's artist/album/title ordering
+CREATE INDEX IF NOT EXISTS ix_songs_sort ON songs (lower(artist), lower(album), lower(title));
+
+-- Background processing jobs, shared across API workers so the status URL
+-- returned by /upload_content/ resolves no matter which worker serves the poll
+CREATE TABLE IF NOT EXISTS processing_jobs (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'queued',
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
\ No newline at end of file
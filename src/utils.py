@@ -1,8 +1,9 @@
 import os
 import sys
-import streamlit as st
 from loguru import logger
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -30,6 +31,17 @@ if DEBUG_MODE:
 API_URL = os.getenv("API_URL", "http://clonehero_api:8000")
 logger.info(f"🌐 API Base URL: {API_URL}")
 
+# Shared HTTP session so all API calls reuse keep-alive connections; brief
+# retries with backoff ride out transient API restarts
+http = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+)
+http.mount("http://", _adapter)
+http.mount("https://", _adapter)
+
 def make_api_request(endpoint: str, method="GET", data=None, files=None, params=None):
     """
     Handles API requests with better error handling.
@@ -48,7 +60,7 @@ def make_api_request(endpoint: str, method="GET", data=None, files=None, params=
     try:
         headers = {"Accept": "application/json"}
         
-        response = requests.request(
+        response = http.request(
             method=method.upper(),
             url=url,
             headers=headers,
@@ -79,7 +91,14 @@ def display_exception(e, user_msg: str):
         user_msg (str): User-friendly message to display.
     """
     logger.exception(f"{user_msg}: {str(e)}")
-    
+
+    # Imported lazily: utils is shared with non-UI callers, and pulling in
+    # streamlit (and its import-time machinery) only pays off inside the app
+    try:
+        import streamlit as st
+    except ImportError:
+        return  # Non-UI context; the log line above is the record
+
     if DEBUG_MODE:
         st.error(f"{user_msg}: {str(e)}")  # Show detailed error in debug mode
     else: